@@ -22,14 +22,33 @@ from utils import unifiedPath
 
 __jsonPath: Path = unifiedPath("res/shapes.json")
 
+__shapes: dict = None # cache of shape names to Polygons, loaded on first use
+
 #-----------------------------------------------------------------------------
 # private functions
 #-----------------------------------------------------------------------------
 
+# forces closed ring coordinates to be wound counterclockwise, checked by the sign of its shoelace area
+def __forceCCWCoords(coords: np.ndarray) -> np.ndarray:
+    x, y = coords[:, 0], coords[:, 1]
+    if np.dot(x[:-1], y[1:]) - np.dot(y[:-1], x[1:]) < 0: coords = coords[::-1] # negative area is clockwise
+    return coords
+
 # forces shapes to be wound counterclockwise
 def __forceCCW(polygon: shapely.Polygon) -> shapely.Polygon:
-    if not polygon.exterior.is_ccw: polygon = shapely.Polygon(polygon.exterior.reverse())
-    return polygon
+    coords = shapely.get_coordinates(polygon.exterior)
+    ccwCoords = __forceCCWCoords(coords)
+    return polygon if ccwCoords is coords else shapely.Polygon(ccwCoords)
+
+# loads and caches all shapes from the JSON as CCW Polygons, only reads the file once
+def __loadShapes() -> dict[str, shapely.Polygon]:
+    global __shapes
+    if __shapes is None:
+        with open(__jsonPath, "r") as f:
+            __shapes = {
+                name: __forceCCW(shapely.Polygon(coords)) for name, coords in load(f).items()
+            }
+    return __shapes
 
 #-----------------------------------------------------------------------------
 # public functions
@@ -37,20 +56,15 @@ def __forceCCW(polygon: shapely.Polygon) -> shapely.Polygon:
 
 def allShapes() -> list[str]:
     "Returns a list of all available shape names."
-    with open(__jsonPath, "r") as f:
-        return list(load(f).keys())
+    return list(__loadShapes().keys())
 
 def randomShape() -> str:
     "Returns the name of a shape selected at random from the entire available set."
-    with open(__jsonPath, "r") as f:
-        return random.choice(list(load(f).keys()))
+    return random.choice(tuple(__loadShapes().keys()))
 
 def get(shapeName: str) -> shapely.Polygon:
     "Returns a Polygon corresponding to the specified shape name."
-    with open(__jsonPath, "r") as f:
-        return __forceCCW(
-            shapely.Polygon(load(f)[shapeName])
-        )
+    return __loadShapes()[shapeName] # already CCW, Polygons are immutable so sharing is safe
 
 def extrude(polygon: shapely.Polygon, depth: float = 1.0) -> dict:
     """
@@ -59,69 +73,72 @@ def extrude(polygon: shapely.Polygon, depth: float = 1.0) -> dict:
     
     The dictionary contains 6 keys: `polygon`, `vertices`, `lines`, `bases`, `quads`, and `isConvex`.
     `polygon` contains the original source Polygon.
-    `vertices` contains a list of tuple points in 3D space.
+    `vertices` contains an N x 3 NumPy array of points in 3D space.
     `lines` contains a list of tuple indices connecting pairs of points as lines.
     `bases` contains a list of tuple indices connecting sets of points as the top and bottom of the extruded prism.
     `quads` contains a list of tuple indices connecting quads of points as sides of the extruded prism.
     `isConvex` is a boolean that specifies whether the Polygon is convex or not.
     """
     # ensure 100% winding is CCW before doing ANYTHING
-    polygon = __forceCCW(polygon)
+    coords = shapely.get_coordinates(polygon.exterior)
+    ccwCoords = __forceCCWCoords(coords)
+    if ccwCoords is not coords: polygon = shapely.Polygon(ccwCoords)
 
     # define other things
-    num: int = shapely.count_coordinates(polygon.exterior) - 1 # remove duplicate
-    exterior: list = shapely.get_coordinates(polygon.exterior).tolist()[:num]
+    num: int = max(len(ccwCoords) - 1, 0) # remove duplicate, 0 if empty
+    exterior: np.ndarray = ccwCoords[:num]
+
+    # index math done vectorized over all vertices at once
+    i = np.arange(num)
+    prev = (i - 1) % num # index of vertex before i, wrapping around
+
+    vertices = np.empty((2 * num, 3), dtype = np.float64) # one contiguous buffer shared by rendering and normals
+    vertices[:num, :2] = exterior[::-1] # bottom reversed for CCW winding when looking at it
+    vertices[:num, 2] = 0.0
+    vertices[num:, :2] = exterior # top
+    vertices[num:, 2] = depth
+    lines = np.concatenate([
+        np.column_stack([i, prev]), # bottom
+        np.column_stack([i, prev]) + num, # top
+        np.column_stack([i, -i + (2 * num - 1)]) # sides
+    ])
+    quads = np.column_stack([
+        i,                      # BL
+        prev,                   # BR
+        (-i % num) + num,       # TR
+        ((-i - 1) % num) + num  # TL
+    ])
+
+    # cross products of consecutive edges, the direction of each turn around the polygon
+    edges = np.roll(exterior, -1, axis = 0) - exterior
+    turns = edges[:, 0] * np.roll(edges[:, 1], -1) - edges[:, 1] * np.roll(edges[:, 0], -1)
 
     # processing
     return {
         "polygon": polygon,
-        "vertices": [ # bottom
-                (x, y, 0.0) for x, y in exterior[::-1] # bottom reversed for CCW winding when looking at it
-            ] + [ # top
-                (x, y, depth) for x, y in exterior
-            ],
-        "lines": [ # bottom
-                (i, (i - 1) % num) for i in range(num)
-            ] + [ # top
-                (i + num, ((i - 1) % num) + num) for i in range(num)
-            ] + [ # sides
-                (i, -i + (2 * num - 1)) for i in range(num)
-            ],
+        "vertices": vertices,
+        "lines": list(map(tuple, lines.tolist())),
         "bases": [
-                tuple([ # bottom
-                    i for i in range(num)
-                ])
-            ] + [
-                tuple([ # top
-                    i + num for i in range(num)
-                ])
-            ],
-        "quads": [
-                (
-                    i,                      # BL
-                    (i - 1) % num,          # BR
-                    (-i % num) + num,       # TR
-                    ((-i - 1) % num) + num  # TL
-                ) for i in range(num) 
+                tuple(range(num)), # bottom
+                tuple(range(num, 2 * num)) # top
             ],
-        "isConvex": bool(shapely.equals(polygon, polygon.convex_hull)) # check if convex by comparison to its convex hull
+        "quads": list(map(tuple, quads.tolist())),
+        "isConvex": bool(np.all(turns >= 0) or np.all(turns <= 0)) # convex if every turn goes the same way
     }
 
-def spacialTransform(polygon: shapely.Polygon, transformMat: list) -> shapely.Polygon:
-    "Calculates and returns the result of a manual transformation of a Polygon based on the given 3-dimensional transformation matrix."
-    points = np.array(shapely.get_coordinates(polygon))
-
-    return __forceCCW( # ensure just in case
-        shapely.Polygon(
-            (
-                np.hstack([ # homogenize Nx2 polygon matrix to Nx4 for dot product
-                    points,
-                    np.zeros((points.shape[0], 1)), # add column of zeros
-                    np.ones((points.shape[0], 1)) # add column of ones
-                ])
-                @ np.array(transformMat)
-            )[:, :2]
-        )
+def spacialTransform(polygon: shapely.Polygon, transformMat: list | np.ndarray) -> shapely.Polygon:
+    """
+    Calculates and returns the result of a manual transformation of a Polygon based on the given 3-dimensional transformation matrix.
+
+    `transformMat` may be a nested list or a NumPy array.
+    When transforming many Polygons by the same matrix, convert it to a float64 array once beforehand to skip conversion per call.
+    """
+    points = shapely.get_coordinates(polygon)
+    mat = np.ascontiguousarray(transformMat, dtype = np.float64) # no copy if already a contiguous float64 array
+
+    # input z is always 0 and w always 1, so only the XY block and translation row of the 4x4 matter
+    return shapely.Polygon(
+        __forceCCWCoords(points @ mat[:2, :2] + mat[3, :2]) # ensure just in case
     )
 
 def andPolygons(polygon1: shapely.Polygon, polygon2: shapely.Polygon) -> shapely.Polygon:
@@ -132,6 +149,12 @@ def andPolygons(polygon1: shapely.Polygon, polygon2: shapely.Polygon) -> shapely
     If the resulting AND operation returns a MultiPolygon (when multiple areas are shared),
     the Polygon with the largest area will be used.
     """
+    # nothing can be shared if bounding boxes do not overlap, skip the full intersection
+    minX1, minY1, maxX1, maxY1 = polygon1.bounds
+    minX2, minY2, maxX2, maxY2 = polygon2.bounds
+    if maxX1 < minX2 or maxX2 < minX1 or maxY1 < minY2 or maxY2 < minY1:
+        return shapely.Polygon() # return empty
+
     result = shapely.intersection(
         polygon1, polygon2,
         grid_size = 0.05
@@ -139,12 +162,9 @@ def andPolygons(polygon1: shapely.Polygon, polygon2: shapely.Polygon) -> shapely
 
     # check for not polygon, choose largest
     if not isinstance(result, shapely.Polygon):
-        largest: shapely.Polygon = shapely.Polygon() # start empty
-        try:
-            for p in result.geoms:
-                if isinstance(p, shapely.Polygon) and p.area > largest.area: # if geom is a polygon and has larger area
-                    largest = p
-        except AttributeError: # if is a Geometry that is not a collection of geoms
+        parts: np.ndarray = shapely.get_parts(result) # a non-collection Geometry is its own only part
+        parts = parts[shapely.get_type_id(parts) == shapely.GeometryType.POLYGON] # only keep polygons
+        if len(parts) == 0:
             return shapely.Polygon() # return empty
-        return __forceCCW(largest)
+        return __forceCCW(parts[shapely.area(parts).argmax()])
     else: return __forceCCW(result)
\ No newline at end of file
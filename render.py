@@ -13,6 +13,7 @@ from OpenGL.GL import *
 from OpenGL.GLU import *
 import numpy as np
 import glfw
+import ctypes
 
 #-----------------------------------------------------------------------------
 # globals
@@ -44,49 +45,129 @@ __glCapabilities: list            = [
 # lighting
 __light0Pos: list[float]          = [-10.0, -10.0, 0.0, 1.0] # behind left light for shapes
 __light1Pos: list[float]          = [0.0, 0.0, 10.0, 0.0] # direct light towards top of shapes
-__lightDiffuse: list[float]       = lambda strength : [strength, strength, strength, 1.0]
+__lightDiffuseHalf: ctypes.Array  = (GLfloat * 4)(0.5, 0.5, 0.5, 1.0) # prebuilt C arrays so they are not converted every frame
+__lightDiffuseFull: ctypes.Array  = (GLfloat * 4)(1.0, 1.0, 1.0, 1.0)
+
+# memo of 0 - 255 colors to their normalized 0 - 1 versions, only a few distinct colors are ever used
+__normalizedColors: dict          = {}
 
 #-----------------------------------------------------------------------------
 # objects
 #-----------------------------------------------------------------------------
 
 __window: glfw._GLFWwindow  = None # placeholder for when window is created
+__context: glfw._GLFWwindow = None # window whose OpenGL context was last made current
+__pixelBuffers: np.ndarray  = None # placeholder for the pair of pixel buffer objects alternated between reads, created during init
+__pixelBufferIndex: int     = 0 # index of the pixel buffer to read the next frame into
+__pixelBufferStale: bool    = True # whether the other pixel buffer holds a frame not meant to be shown, such as from another page
+__tess: GLUtesselator       = None # placeholder for the reusable tessellator, created during init
 
 #-----------------------------------------------------------------------------
 # private functions
 #-----------------------------------------------------------------------------
 
-# Calculates and returns a matrix representing the normal vector of the specified face
-def __getNormal(face: tuple[int, ...], vertexArray: list[tuple[float, float, float]]) -> tuple[float]:
-    netNormal = np.array([0.0, 0.0, 0.0]) # start with empty vector
-    # run through and summate every pair
-    for i in range(len(face)):
-        netNormal += np.cross(
-            np.array(vertexArray[face[(i + 1) % len(face)]]) - np.array(vertexArray[face[i]]),                   # current vector line
-            np.array(vertexArray[face[(i + 2) % len(face)]]) - np.array(vertexArray[face[(i + 1) % len(face)]])  # vector line ahead
-        )
-    return tuple((netNormal / np.linalg.norm(netNormal)).tolist())
+# Calculates and returns the normal vectors of the specified faces, which must all have the same number of vertices
+def __getNormals(faces: list[tuple[int, ...]], vertexArray: np.ndarray) -> np.ndarray:
+    if len(faces) == 0: return np.empty((0, 3))
+    points = vertexArray[np.asarray(faces, dtype = np.intp)] # F x K x 3 vertices of every face at once
+    ahead = np.roll(points, -1, axis = 1)
+    # summate the cross of every pair of current vector line and vector line ahead, for all faces in one go
+    netNormals = np.cross(
+        ahead - points,
+        np.roll(points, -2, axis = 1) - ahead
+    ).sum(axis = 1)
+    return netNormals / np.linalg.norm(netNormals, axis = 1, keepdims = True)
+
+# Returns the given color normalized to the 0 - 1 range, calculated only once per distinct color
+def __normalizeColor(col: tuple[int, int, int]) -> tuple[float, float, float]:
+    normalized = __normalizedColors.get(col)
+    if normalized is None:
+        normalized = __normalizedColors[col] = (col[0] / 255, col[1] / 255, col[2] / 255)
+    return normalized
+
+# Renders the given set of vertices as a wireframe of vertices and lines, without transformations
+def __wireframe(
+    vertexArray: np.ndarray, lineArray: list[tuple[int, int]],
+    vertexCol: tuple[int, int, int], lineCol: tuple[int, int, int],
+    vertexDiameter: int, lineWidth: int
+):
+    # line rendering FIRST
+    glColor3dv(__normalizeColor(lineCol)) # normalize to 0 - 1 range
+    glLineWidth(lineWidth)
+    glEnableClientState(GL_VERTEX_ARRAY) # submit all vertices at once instead of one call each
+    glVertexPointer(3, GL_DOUBLE, 0, np.ascontiguousarray(vertexArray, dtype = np.float64))
+    lineIndices = np.asarray(lineArray, dtype = np.uint32).ravel()
+    glDrawElements(GL_LINES, lineIndices.size, GL_UNSIGNED_INT, lineIndices) # draw each line
+
+    # vertex rendering
+    glColor3dv(__normalizeColor(vertexCol))
+    glPointSize(vertexDiameter)
+    glDrawArrays(GL_POINTS, 0, len(vertexArray)) # draw each vertex
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+# Renders the given base faces of a polygon, filled and shaded by their normals
+def __drawBases(vertexArray: np.ndarray, baseArray: list[tuple[int, ...]], isConvex: bool):
+    baseNormals = __getNormals(baseArray, vertexArray) # both bases always have the same number of vertices
+
+    if isConvex:
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_DOUBLE, 0, vertexArray)
+        for face, normal in zip(baseArray, baseNormals):
+            glNormal3dv(normal) # define the normal for each face
+            glDrawElements(GL_POLYGON, len(face), GL_UNSIGNED_INT, np.asarray(face, dtype = np.uint32))
+        glDisableClientState(GL_VERTEX_ARRAY)
+    else: # tessellation time
+        for face, normal in zip(baseArray, baseNormals):
+            glNormal3dv(normal)
+            __tessellate(face, vertexArray)
+
+# Returns the vertices and matching normals of the given quad faces,
+# with vertices expanded per quad so that each can have its own flat normal
+def __expandQuads(vertexArray: np.ndarray, quadArray: list[tuple[int, int, int, int]]) -> tuple[np.ndarray, np.ndarray]:
+    quadVertices = vertexArray[np.asarray(quadArray, dtype = np.intp)].reshape(-1, 3)
+    quadNormals = np.repeat(__getNormals(quadArray, vertexArray), 4, axis = 0)
+    return quadVertices, quadNormals
+
+# Returns the vertices and matching normals of the given convex base faces split into triangle fans,
+# with vertices expanded per triangle so that they can be drawn together with other polygons
+def __expandBases(vertexArray: np.ndarray, baseArray: list[tuple[int, ...]]) -> tuple[np.ndarray, np.ndarray]:
+    faces = np.asarray(baseArray, dtype = np.intp) # both bases always have the same number of vertices
+    if faces.ndim != 2 or faces.shape[1] < 3: return np.empty((0, 3)), np.empty((0, 3))
+    fans = np.stack(( # every triangle shares the first vertex of its face, keeping the face winding
+        np.repeat(faces[:, :1], faces.shape[1] - 2, axis = 1), faces[:, 1:-1], faces[:, 2:]
+    ), axis = 2)
+    baseVertices = vertexArray[fans.reshape(-1)]
+    baseNormals = np.repeat(__getNormals(baseArray, vertexArray), 3 * (faces.shape[1] - 2), axis = 0)
+    return baseVertices, baseNormals
+
+# Renders the given expanded face vertices and normals all at once, as primitives of the given mode
+def __drawFaces(vertices: np.ndarray, normals: np.ndarray, mode: int = GL_QUADS):
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_NORMAL_ARRAY)
+    glVertexPointer(3, GL_DOUBLE, 0, vertices)
+    glNormalPointer(GL_DOUBLE, 0, normals)
+    glDrawArrays(mode, 0, len(vertices))
+    glDisableClientState(GL_NORMAL_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
 
 # Renders the given concave face using tessellation as a continous, filled polygon
-def __tessellate(face: tuple[int, ...], vertexArray: list[tuple[float, float, float]]):
-    # setup
-    tess: GLUtesselator = gluNewTess()
-    gluTessCallback(tess, GLU_TESS_BEGIN, glBegin)
-    gluTessCallback(tess, GLU_TESS_END, glEnd)
-    gluTessCallback(tess, GLU_TESS_VERTEX, glVertex3dv)
-    gluTessCallback(tess, GLU_TESS_COMBINE, lambda coordinates : coordinates)
-    gluTessBeginPolygon(tess, None)
-    gluTessBeginContour(tess)
+def __tessellate(face: tuple[int, ...], vertexArray: np.ndarray):
+    # setup, reusing the tessellator made in init
+    gluTessBeginPolygon(__tess, None)
+    gluTessBeginContour(__tess)
 
     # tessellate
     for vertexIndex in face:
-        coord = (GLdouble * 3)(*vertexArray[vertexIndex]) # "convert to C-style arrays required by GLU" apparently
-        gluTessVertex(tess, coord, coord)
+        coord = vertexArray[vertexIndex] # row of the contiguous float64 array is already a C-style array for GLU
+        gluTessVertex(__tess, coord, coord)
     
     # end
-    gluTessEndContour(tess)
-    gluTessEndPolygon(tess)
-    gluDeleteTess(tess)
+    gluTessEndContour(__tess)
+    gluTessEndPolygon(__tess)
+
+    # drop the Python-side references GLU kept for this polygon, otherwise they pile up on the reused tessellator
+    __tess.vertexCache = None
+    __tess.dataPointers = {}
 
 #-----------------------------------------------------------------------------
 # public functions
@@ -118,6 +199,7 @@ def init(
     # create and set window
     global __window ; __window = glfw.create_window(width, height, "Hidden OpenGL context", None, None)
     glfw.make_context_current(__window) # ensure correct OpenGL context
+    global __context ; __context = __window
 
     # initialize OpenGL
     glMatrixMode(GL_PROJECTION) # load projection matrix stack
@@ -141,9 +223,27 @@ def init(
     
     glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
 
+    # create tessellator once for all concave faces
+    global __tess ; __tess = gluNewTess()
+    gluTessCallback(__tess, GLU_TESS_BEGIN, glBegin)
+    gluTessCallback(__tess, GLU_TESS_END, glEnd)
+    gluTessCallback(__tess, GLU_TESS_VERTEX, glVertex3dv)
+    gluTessCallback(__tess, GLU_TESS_COMBINE, lambda coordinates : coordinates)
+
     # store screen dimensions
     global __screenWidth, __screenHeight ; __screenWidth, __screenHeight = width, height
 
+    # allocate two pixel buffers to alternate reads between, so a read never has to wait on the frame just rendered
+    global __pixelBuffers ; __pixelBuffers = glGenBuffers(2)
+    for pixelBuffer in __pixelBuffers:
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pixelBuffer)
+        glBufferData(GL_PIXEL_PACK_BUFFER, np.zeros(width * height * 4, dtype = np.uint8), GL_STREAM_READ) # start transparent
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    # pixel read state never changes afterwards, so it is set just once
+    glPixelStorei(GL_PACK_ALIGNMENT, 1) # set pixel storage mode
+    glReadBuffer(GL_FRONT)
+
 def setupScene(xtheta: float = -45.0):
     """
     Sets up the scene with a worldview rotation and lights.
@@ -157,13 +257,13 @@ def setupScene(xtheta: float = -45.0):
 
     # setup lights
     glLightfv(GL_LIGHT0, GL_POSITION, __light0Pos) # LIGHT0
-    glLightfv(GL_LIGHT0, GL_DIFFUSE, __lightDiffuse(0.5))
+    glLightfv(GL_LIGHT0, GL_DIFFUSE, __lightDiffuseHalf)
 
     glLightfv(GL_LIGHT1, GL_POSITION, __light1Pos) # LIGHT1
-    glLightfv(GL_LIGHT1, GL_DIFFUSE, __lightDiffuse(1.0))
+    glLightfv(GL_LIGHT1, GL_DIFFUSE, __lightDiffuseFull)
 
 def drawWireframe(
-    vertexArray: list[tuple[float, float, float]], lineArray: list[tuple[int, int]],
+    vertexArray: np.ndarray, lineArray: list[tuple[int, int]],
     vertexCol: tuple[int, int, int], lineCol: tuple[int, int, int],
     vertexDiameter: int = 8, lineWidth: int = 2,
     dx: float = 0.0, dy: float = 0.0, dz: float = 0.0,
@@ -184,31 +284,53 @@ def drawWireframe(
     glTranslated(dx, dy, dz)
     glRotated(theta, 0, 0, 1)
 
-    # line rendering FIRST
-    glColor3d(
-        lineCol[0] / 255, lineCol[1] / 255, lineCol[2] / 255 # normalize to 0 - 1 range
-    )
-    glLineWidth(lineWidth)
-    glBegin(GL_LINES)
-    for line in lineArray: # draw each line
-        for vertexIndex in line:
-            glVertex3dv(vertexArray[vertexIndex])
-    glEnd()
+    __wireframe(vertexArray, lineArray, vertexCol, lineCol, vertexDiameter, lineWidth)
 
-    # vertex rendering
-    glColor3d(
-        vertexCol[0] / 255, vertexCol[1] / 255, vertexCol[2] / 255
-    )
-    glPointSize(vertexDiameter)
-    glBegin(GL_POINTS)
-    for vertex in vertexArray: # draw each vertex
-        glVertex3dv(vertex)
-    glEnd()
+    glPopMatrix() # restores previous stack
+
+def compileWireframe(
+    vertexArray: np.ndarray, lineArray: list[tuple[int, int]],
+    vertexCol: tuple[int, int, int], lineCol: tuple[int, int, int],
+    vertexDiameter: int = 8, lineWidth: int = 2
+) -> int:
+    """
+    Compiles the given wireframe into an OpenGL display list and returns its name.
+    Arguments are identical to those of `drawWireframe` excluding transformations.
+
+    Render with `callWireframe` for wireframes that stay the same across frames,
+    and free with `deleteWireframe` once no longer needed.
+    """
+    listName: int = glGenLists(1)
+    glNewList(listName, GL_COMPILE)
+    __wireframe(vertexArray, lineArray, vertexCol, lineCol, vertexDiameter, lineWidth)
+    glEndList()
+    return listName
+
+def callWireframe(
+    listName: int,
+    dx: float = 0.0, dy: float = 0.0, dz: float = 0.0,
+    theta: float = 0.0
+):
+    """
+    Renders the wireframe display list of the given name from `compileWireframe`.
+    Transformations are identical to those of `drawWireframe`.
+    """
+    glPushMatrix() # saves current stack
+
+    # apply transformations
+    glTranslated(dx, dy, dz)
+    glRotated(theta, 0, 0, 1)
+
+    glCallList(listName)
 
     glPopMatrix() # restores previous stack
 
+def deleteWireframe(listName: int):
+    "Frees the wireframe display list of the given name from `compileWireframe`."
+    glDeleteLists(listName, 1)
+
 def drawPolygon(
-    vertexArray: list[tuple[float, float, float]],
+    vertexArray: np.ndarray,
     baseArray: list[tuple[int, ...]], quadArray: list[tuple[int, int, int, int]],
     isConvex: bool,
     avgColor: tuple[int, int, int],
@@ -234,39 +356,72 @@ def drawPolygon(
     glRotated(theta, 0, 0, 1)
 
     # set color
-    glColor3d(
-        avgColor[0] / 255, avgColor[1] / 255, avgColor[2] / 255
-    )
+    glColor3dv(__normalizeColor(avgColor))
 
-    # render bases
-    if isConvex:
-        for face in baseArray:
-            glBegin(GL_POLYGON)
-            glNormal3dv(
-                __getNormal(face, vertexArray) # define the normal for each face
-            )
-            for vertexIndex in face:
-                glVertex3dv(vertexArray[vertexIndex])
-            glEnd()
-    else: # tessellation time
-        for face in baseArray:
-            glNormal3dv(
-                __getNormal(face, vertexArray)
-            )
-            __tessellate(face, vertexArray)
+    # submit all vertices at once instead of one call each
+    vertices = np.ascontiguousarray(vertexArray, dtype = np.float64)
+    __drawBases(vertices, baseArray, isConvex)
 
     # render quads
-    glBegin(GL_QUADS)
-    for face in quadArray:
-        glNormal3dv(
-            __getNormal(face, vertexArray)
-        )
-        for vertexIndex in face:
-            glVertex3dv(vertexArray[vertexIndex])
-    glEnd()
+    quadVertices, quadNormals = __expandQuads(vertices, quadArray)
+    __drawFaces(quadVertices, quadNormals)
 
     glPopMatrix() # restores previous stack
 
+def drawPolygons(
+    polygons: list[tuple[np.ndarray, list[tuple[int, ...]], list[tuple[int, int, int, int]], bool]],
+    avgColors: np.ndarray | list[tuple[int, int, int]],
+    transforms: list[tuple[float, float, float, float]]
+):
+    """
+    Renders many sets of faces as continuous, filled polygons, identical to calling `drawPolygon` for each,
+    but with the quads of every polygon, and the bases of every convex polygon, each submitted in a single draw call.
+
+    `polygons` specifies each polygon as a tuple of its `vertexArray`, `baseArray`, `quadArray`, and `isConvex`.
+    `avgColors` specifies the color of each polygon as rows, with values ranging from `0` to `255`.
+    `transforms` specifies the `dx`, `dy`, `dz`, and `theta` of each polygon as a tuple.
+    """
+    batches: dict = { # vertices, normals, and colors of every polygon, by the primitive they are drawn as
+        GL_TRIANGLES: ([], [], []), GL_QUADS: ([], [], [])
+    }
+    colors = np.asarray(avgColors, dtype = np.float64).reshape(-1, 3) / 255 # normalize all at once
+
+    for (vertexArray, baseArray, quadArray, isConvex), color, (dx, dy, dz, theta) in zip(polygons, colors, transforms):
+        vertices = np.ascontiguousarray(vertexArray, dtype = np.float64)
+
+        # faces are transformed here instead of by OpenGL so that all of them can share one buffer
+        rad = np.radians(theta)
+        rotation = np.array([ # rotation about z-axis, transposed for row vectors
+            [np.cos(rad), np.sin(rad), 0.0],
+            [-np.sin(rad), np.cos(rad), 0.0],
+            [0.0, 0.0, 1.0]
+        ])
+
+        if isConvex:
+            faces = ((GL_TRIANGLES, __expandBases(vertices, baseArray)), (GL_QUADS, __expandQuads(vertices, quadArray)))
+        else: # concave bases need tessellation, so they are still rendered per polygon with its own transformations
+            glPushMatrix() # saves current stack
+            glTranslated(dx, dy, dz)
+            glRotated(theta, 0, 0, 1)
+            glColor3dv(color)
+            __drawBases(vertices, baseArray, isConvex)
+            glPopMatrix() # restores previous stack
+            faces = ((GL_QUADS, __expandQuads(vertices, quadArray)),)
+
+        for mode, (faceVertices, faceNormals) in faces:
+            batchVertices, batchNormals, batchColors = batches[mode]
+            batchVertices.append(faceVertices @ rotation + (dx, dy, dz))
+            batchNormals.append(faceNormals @ rotation)
+            batchColors.append(np.broadcast_to(color, faceVertices.shape))
+
+    # render each primitive of every polygon at once, colored per vertex
+    glEnableClientState(GL_COLOR_ARRAY)
+    for mode, (batchVertices, batchNormals, batchColors) in batches.items():
+        if len(batchVertices) == 0: continue
+        glColorPointer(3, GL_DOUBLE, 0, np.concatenate(batchColors))
+        __drawFaces(np.concatenate(batchVertices), np.concatenate(batchNormals), mode)
+    glDisableClientState(GL_COLOR_ARRAY)
+
 def getMatrix(
     dx: float, dy: float, dz: float,
     theta: float
@@ -284,19 +439,42 @@ def getMatrix(
 
     return mat
 
-def toBytes():
-    "Returns the OpenGL thread frame matrix as raw byte data."
-    glPixelStorei(GL_PACK_ALIGNMENT, 1) # set pixel storage mode
-    glReadBuffer(GL_FRONT)
-    glFinish()
-    
-    # get pixel array
-    return np.frombuffer(
-        buffer = glReadPixels(0, 0, __screenWidth, __screenHeight, GL_RGBA, GL_UNSIGNED_BYTE),
-        dtype = np.uint8
-    ).reshape( # reshape into proper shape
-        (__screenHeight, __screenWidth, 4)
-    ).tobytes()
+def toBytes() -> bytes:
+    """
+    Returns the OpenGL thread frame matrix as raw byte data.
+
+    The read is asynchronous, so the data returned is that of the previous call, one frame behind.
+    After `discardReadback`, the first call waits for and returns the current frame instead.
+    """
+    # start reading the current frame into one pixel buffer, returns immediately
+    global __pixelBufferIndex, __pixelBufferStale
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, __pixelBuffers[__pixelBufferIndex])
+    glReadPixels(0, 0, __screenWidth, __screenHeight, GL_RGBA, GL_UNSIGNED_BYTE, 0) # offset 0 into bound buffer
+
+    if __pixelBufferStale: # previous frame is not wanted, so wait on the current one still bound
+        __pixelBufferStale = False
+        readIndex = __pixelBufferIndex
+    else: # get pixel array of the previous frame, long since done reading into the other
+        readIndex = 1 - __pixelBufferIndex
+    __pixelBufferIndex = 1 - __pixelBufferIndex
+
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, __pixelBuffers[readIndex])
+    data = ctypes.string_at(
+        glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY),
+        __screenWidth * __screenHeight * 4
+    )
+    glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    return data
+
+def discardReadback():
+    """
+    Discards the frame held back by `toBytes`, so that its next call returns the frame just rendered.
+
+    Should be called when the rendered scene changes entirely, such as when entering a page.
+    """
+    global __pixelBufferStale ; __pixelBufferStale = True
 
 def reset():
     """
@@ -304,7 +482,10 @@ def reset():
     
     Must be called periodically at the start of loops.
     """
-    glfw.make_context_current(__window) # ensure correct OpenGL context
+    global __context
+    if __context is not __window: # ensure correct OpenGL context, only switch if it is not already current
+        glfw.make_context_current(__window)
+        __context = __window
     glViewport(0, 0, __screenWidth, __screenHeight)
     glClearColor(0.0, 0.0, 0.0, 0.0)
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT | GL_STENCIL_BUFFER_BIT) # clear buffers
@@ -320,5 +501,8 @@ def finish():
 
 def end():
     "Ends the current glfw OpenGL context."
+    gluDeleteTess(__tess)
+    glDeleteBuffers(2, __pixelBuffers)
     glfw.destroy_window(__window)
+    global __context ; __context = None
     glfw.terminate()
\ No newline at end of file
@@ -3,10 +3,13 @@
 # Made for ICS3U1.
 
 from pathlib import Path
+from functools import lru_cache
+from collections import deque
 from random import randint
 from math import floor
 from platform import system
 import pygame
+import numpy as np
 
 import utils, polygons, render
 
@@ -21,11 +24,22 @@ height: int               = 720
 pageNum: int              = 0 # 0 is menu, 1 is level selection, 2 is game, 3 is settings, 4 is tutorial, 5 is credits
 lastPage: int             = 0 # keep track of previous page visited
 fps: int                  = 60 # global fps
+pageFps: int              = 30 # fps of menu pages, where only buttons and the background shape move
+mousePos: tuple[int, int] = (0, 0) # mouse position, polled once per frame
+mouseDown: bool           = False # whether left mouse button is held, polled once per frame
 
 # fonts
 regularFont: Path         = utils.unifiedPath("res/fonts/regular.ttf")
 boldFont: Path            = utils.unifiedPath("res/fonts/bold.ttf")
 
+# full screen backdrops, fully opaque
+backdrops: tuple[Path, ...] = tuple(
+    utils.unifiedPath(f"res/sprites/misc/{name}.png") for name in ("backdrop", "settings", "tutorial", "credits")
+)
+
+# sound effects
+sounds: dict              = {} # every loaded sound effect by path, shared so their volume can be set all at once
+
 #-----------------------------------------------------------------------------
 # game settings
 #-----------------------------------------------------------------------------
@@ -42,9 +56,27 @@ def getGlRender() -> pygame.Surface:
     "Returns a Surface of the current OpenGL glfw context buffer."
     return pygame.image.frombytes(render.toBytes(), (width, height), "RGBA", flipped = True)
 
-def getMouseX(invert: bool) -> int:
-    "Gets the current mouse X position. Inverts if `invert` is `True`."
-    return abs(invert * width - pygame.mouse.get_pos()[0])
+def quitRequested(wait: bool = False) -> bool:
+    """
+    Returns whether the window has been requested to close, discarding every other queued event.
+    Only quit events are fetched so the rest of the queue is never walked in Python.
+
+    If `wait` is `True`, first waits up to one frame for any event.
+    Lets the process sleep instead of polling on pages that are idle until input.
+    """
+    if wait and pygame.event.wait(1000 // fps).type == pygame.QUIT:
+        return True
+    requested = bool(pygame.event.get(pygame.QUIT))
+    pygame.event.clear(pump = False) # no pump, so events arriving since the get are kept
+    return requested
+
+def pollMouse():
+    """
+    Polls the current mouse position and left button state, shared by all widgets for the rest of the frame.
+
+    Should be called periodically right after handling events.
+    """
+    global mousePos, mouseDown ; mousePos, mouseDown = pygame.mouse.get_pos(), pygame.mouse.get_pressed()[0]
 
 def wrapMouse():
     """
@@ -58,13 +90,71 @@ def wrapMouse():
     elif pos[0] > width - 5: # right edge, buffer of 5 px for cursor width
         pygame.mouse.set_pos(1, pos[1]) # send to left edge plus 1 px
 
+@lru_cache(maxsize = None)
+def loadFont(path: Path, size: int) -> pygame.Font:
+    """
+    Returns the font at the given path and size.
+    Cached so that every font is only opened once, which also lets the text caches below hit across page entries.
+    """
+    return pygame.Font(path, size)
+
+@lru_cache(maxsize = 256)
+def textSize(font: pygame.Font, text: str) -> tuple[int, int]:
+    "Returns the rendered size of the text in the given font. Memoized since most measured strings never change."
+    return font.size(text)
+
+@lru_cache(maxsize = 256)
+def renderText(font: pygame.Font, text: str, color: tuple[int, int, int]) -> pygame.Surface:
+    "Returns the antialiased Surface of the text in the given font and color. Memoized to not rasterize unchanged text again."
+    return font.render(text, True, color)
+
+@lru_cache(maxsize = None)
+def loadImage(path: Path, opaque: bool = False) -> pygame.Surface:
+    """
+    Returns the image at the given path converted to the display pixel format for faster blits.
+    Cached so that every image is only decoded once, which means the returned Surface is shared between all users.
+
+    If `opaque` is `True`, the alpha channel is dropped so that blits are straight copies instead of blends.
+    """
+    image: pygame.Surface = pygame.image.load(path)
+    return image.convert() if opaque else image.convert_alpha()
+
+def loadSound(path: Path) -> pygame.mixer.Sound:
+    """
+    Returns the sound effect at the given path, set to the current sound effect volume.
+    Cached so that every sound is only decoded once, which means the returned Sound is shared between all users.
+    """
+    if path not in sounds:
+        sounds[path] = pygame.mixer.Sound(path)
+        sounds[path].set_volume(sfxState / 3)
+    return sounds[path]
+
+def preloadAssets():
+    """
+    Loads every sprite and sound effect into their caches at once.
+    Pages and widgets then never decode files from disk when they are entered or constructed.
+    """
+    for path in utils.unifiedPath("res/sprites").rglob("*.png"):
+        if path in backdrops:
+            loadImage(path, opaque = True)
+        else:
+            loadImage(path)
+    for path in utils.unifiedPath("res/audio/sfx").glob("*.mp3"):
+        loadSound(path)
+
+def setSfxState(state: int):
+    "Sets the sound effect volume state and applies its volume to every loaded sound effect."
+    global sfxState ; sfxState = state
+    for sound in sounds.values():
+        sound.set_volume(sfxState / 3) # range from 0 to 1
+
 def topCenterTextPos(
     font: pygame.Font, text: str,
     topMargin: int
 ) -> tuple[int, int]:
     "Calculates and returns the position needed to blit center-aligned text based on top margin."
     return (
-        width / 2 - font.size(text)[0] / 2,
+        width / 2 - textSize(font, text)[0] / 2,
         topMargin
     )
 
@@ -73,9 +163,9 @@ def topRightTextPos(
     rightMargin: int, topMargin: int
 ) -> tuple[int, int]:
     "Calculates and returns the position needed to blit right-aligned text based on top right margin."
-    size: tuple[int, int] = font.size(text)
+    size: tuple[int, int] = textSize(font, text)
     return (
-        width - rightMargin - font.size(text)[0], # subtract by margin and size
+        width - rightMargin - size[0], # subtract by margin and size
         topMargin
     )
 
@@ -84,7 +174,7 @@ def bottomRightTextPos(
     rightMargin: int, bottomMargin: int
 ) -> tuple[int, int]:
     "Calculates and returns the position needed to blit right-aligned text based on bottom right margin."
-    size: tuple[int, int] = font.size(text)
+    size: tuple[int, int] = textSize(font, text)
     return (
         width - rightMargin - size[0], # subtract by margin and size
         height - bottomMargin - size[1]
@@ -94,9 +184,9 @@ def bottomRightTextPos(
 # anonymous math functions
 #-----------------------------------------------------------------------------
 
-# mouse tracking rotation based on snapping and initial offset
+# mouse tracking rotation based on snapping and initial offset, from the polled mouse X position inverted if set
 mouseTheta: int = lambda step = 5, offset = 0 : floor( # default values of 5º no offset
-    ((360 * (getMouseX(invertXAxis) / width) + offset) % 360) / step
+    ((360 * ((width - mousePos[0]) if invertXAxis else mousePos[0]) / width + offset) % 360) / step
 ) * step
 
 # random starting angle
@@ -117,6 +207,9 @@ class Button:
     `wipeTime` specifies the wipe time, in seconds, for the selected state sprite and is by default 170 ms.
     `clickSound` is the sound made when clicked, by default is the regular click sound.
     """
+    fadeSteps: int = 16 # number of premultiplied alpha levels for the normal state while wiping
+    __fades: dict  = {} # premultiplied normal state fades by sprite path, shared between buttons
+
     def __init__(
         self,
         pos: tuple[int, int],
@@ -124,85 +217,94 @@ class Button:
         wipeTime: float = 0.17, clickSound: Path = utils.unifiedPath("res/audio/sfx/button_click.mp3")
     ):
         self.__pos                   = pos # position on sreen
-        self.__normalState           = pygame.image.load(normalState)
-        self.__selectedState         = pygame.image.load(selectedState)
-        self.__activeState           = pygame.image.load(activeState)
-        self.__rect: pygame.Rect     = self.__normalState.get_rect(topleft = pos)
-
-        self.__wipePerSecond: float  = self.__selectedState.width / wipeTime
+        self.__wipeTime              = wipeTime
+        self._setSprites(normalState, selectedState, activeState)
         
-        self.__hoverSound            = pygame.mixer.Sound(utils.unifiedPath("res/audio/sfx/button_hover.mp3"))
+        self.__hoverSound            = loadSound(utils.unifiedPath("res/audio/sfx/button_hover.mp3"))
         self.__hoverSoundPlayed      = False # whether hover sound already played
-        self.__clickSound            = pygame.mixer.Sound(clickSound)
+        self.__clickSound            = loadSound(clickSound)
         
         self.wipeProgress: float     = 0
         self.hovering: bool          = False # whether mouse is hovering button
         self.pushed: bool            = False # whether button is simply pressed
         self.clicked: bool           = False # whether button has actually been clicked after mouse up
     
+    def _setSprites(self, normalState: Path, selectedState: Path, activeState: Path):
+        "Swaps the button's state sprites, keeping its wipe and hover state."
+        self.__normalState           = loadImage(normalState)
+        self.__selectedState         = loadImage(selectedState)
+        self.__activeState           = loadImage(activeState)
+        self.__rect: pygame.Rect     = self.__normalState.get_rect(topleft = self.__pos)
+        self.__wipeRect: pygame.Rect = pygame.Rect(0, 0, 0, self.__rect.height) # wiped area of selected state, resized in place
+
+        if normalState not in Button.__fades: # normal state premultiplied at decreasing alphas, instead of set_alpha every frame
+            fades = [self.__normalState.copy() for _ in range(Button.fadeSteps)]
+            for i, fade in enumerate(fades):
+                fade.fill((255, 255, 255, int(255 * (1 - i / Button.fadeSteps))), special_flags = pygame.BLEND_RGBA_MULT)
+            Button.__fades[normalState] = fades
+        self.__normalFades           = Button.__fades[normalState]
+
+        self.__wipePerSecond: float  = self.__selectedState.width / self.__wipeTime
+
+    # Returns the premultiplied normal state matching the current wipe, inverse percentage mapped to alpha range
+    def __fade(self) -> pygame.Surface:
+        return self.__normalFades[min(int(self.wipeProgress / self.__rect.width * Button.fadeSteps), Button.fadeSteps - 1)]
+
     def update(self, dt: float):
         """
         Updates the button view based on mouse events. Should be called periodically.
         `dt` specifies the seconds since the last call.
         """
         self.clicked = False # set first thing
-        if self.__rect.collidepoint(pygame.mouse.get_pos()): # check if mouse inside button
+        fullWidth: int = self.__rect.width
+        if self.__rect.collidepoint(mousePos): # check if mouse inside button
             self.hovering = True
             if not self.__hoverSoundPlayed:
-                self.__hoverSound.set_volume(sfxState / 3)
                 self.__hoverSound.play()
                 self.__hoverSoundPlayed = True
-            if pygame.mouse.get_pressed()[0]:
+            if mouseDown:
                 # active state
                 self.pushed = True
                 self.clicked = False
-                self.wipeProgress = self.__rect.width # reset wipe
+                self.wipeProgress = fullWidth # reset wipe
                 screen.blit(self.__activeState, self.__pos)
             else:
                 # selected state
                 self.clicked = self.pushed # clicked if previously pushed, not if not
-                if self.wipeProgress < self.__rect.width:
-                    self.wipeProgress = min(
-                        self.wipeProgress + self.__wipePerSecond * dt, # constrain to maximum of button length
-                        self.__rect.width
-                    )
-                if self.wipeProgress < self.__rect.width: # check again for other uses
-                    self.__normalState.set_alpha(
-                        255 * (1 - self.wipeProgress / self.__rect.width) # get as inverse percentage mapped to alpha range
-                    )
-                    screen.blit(self.__normalState, self.__pos)
-                    screen.blit(
-                        self.__selectedState, self.__pos,
-                        pygame.Rect(
-                            0, 0, self.wipeProgress, self.__rect.height
-                        )
+                self.wipeProgress = min(
+                    self.wipeProgress + self.__wipePerSecond * dt, # constrain to maximum of button length
+                    fullWidth
+                )
+                if self.wipeProgress < fullWidth:
+                    self.__wipeRect.width = int(self.wipeProgress)
+                    screen.blits(
+                        [
+                            (self.__fade(), self.__pos),
+                            (self.__selectedState, self.__pos, self.__wipeRect)
+                        ],
+                        doreturn = False
                     )
                 else:
                     screen.blit(self.__selectedState, self.__pos)
         else:
             # normal state
             self.pushed = self.hovering = self.__hoverSoundPlayed = self.clicked = False
-            if self.wipeProgress > 0:
-                self.wipeProgress = max(
-                    self.wipeProgress - self.__wipePerSecond * dt, # constrain to minimum of 0
-                    0
-                )
-            if self.wipeProgress > 0: # check again to not draw width of 0
-                self.__normalState.set_alpha(
-                    255 * (1 - self.wipeProgress / self.__rect.width) # get as inverse percentage mapped to alpha range
-                )
-                screen.blit(self.__normalState, self.__pos)
-                screen.blit(
-                    self.__selectedState, self.__pos,
-                    pygame.Rect(
-                        0, 0, self.wipeProgress, self.__rect.height
-                    )
+            self.wipeProgress = max(
+                self.wipeProgress - self.__wipePerSecond * dt, # constrain to minimum of 0
+                0
+            )
+            if self.wipeProgress > 0: # to not draw width of 0
+                self.__wipeRect.width = int(self.wipeProgress)
+                screen.blits(
+                    [
+                        (self.__fade(), self.__pos),
+                        (self.__selectedState, self.__pos, self.__wipeRect)
+                    ],
+                    doreturn = False
                 )
             else:
-                self.__normalState.set_alpha(255)
                 screen.blit(self.__normalState, self.__pos)
         if self.clicked:
-            self.__clickSound.set_volume(sfxState / 3)
             self.__clickSound.play()
 
 class CycleButton:
@@ -218,23 +320,19 @@ class CycleButton:
         normalStates: list[Path], selectedStates: list[Path], activeStates: list[Path],
         initCycleState: int, wipeTime: float = 0.17
     ):
-        self.__buttons        = [ Button(
-            pos, normalStates[i], selectedStates[i], activeStates[i], wipeTime
-        ) for i in range(len(normalStates)) ]
-
-        self.__wipeProgress   = 0.0 # value to transfer between buttons
+        self.__states         = list(zip(normalStates, selectedStates, activeStates)) # sprite paths of each state
+        self.__button         = Button(pos, *self.__states[initCycleState], wipeTime) # single button, sprites swapped on cycle
 
-        self.cycleState: int  = initCycleState # the state of the cycle, is an index for button set
+        self.cycleState: int  = initCycleState # the state of the cycle, is an index for state set
     
     def update(self, dt: float):
         "Updates the cycle button."
-        self.__buttons[self.cycleState].update(dt)
-        self.__wipeProgress = self.__buttons[self.cycleState].wipeProgress
-        if self.__buttons[self.cycleState].clicked: # if current button clicked
-            self.__buttons[self.cycleState].clicked = False # ensure it is false before moving on
-            self.__buttons[self.cycleState].pushed = False # this too
-            self.cycleState = (self.cycleState + 1) % len(self.__buttons) # cycle through
-            self.__buttons[self.cycleState].wipeProgress = self.__wipeProgress # transfer to new
+        self.__button.update(dt)
+        if self.__button.clicked: # if button clicked
+            self.__button.clicked = False # ensure it is false before moving on
+            self.__button.pushed = False # this too
+            self.cycleState = (self.cycleState + 1) % len(self.__states) # cycle through
+            self.__button._setSprites(*self.__states[self.cycleState]) # wipe progress carries over
 
 class HoverItem:
     """
@@ -244,14 +342,14 @@ class HoverItem:
     """
     def __init__(self, pos: tuple[int, int], sprite: Path):
         self.__pos     = pos
-        self.__sprite  = pygame.image.load(sprite)
+        self.__sprite  = loadImage(sprite)
         self.__rect    = self.__sprite.get_rect(topleft = pos)
 
         self.hovering  = False # whether hovering
     
     def update(self, _):
         "Updates the button view based on mouse events. Should be called periodically."
-        self.hovering = self.__rect.collidepoint(pygame.mouse.get_pos())
+        self.hovering = self.__rect.collidepoint(mousePos)
         screen.blit(self.__sprite, self.__pos)
 
 class LevelSelector:
@@ -266,8 +364,6 @@ class LevelSelector:
         self.__reqLevel: str    = ""
         self.__threshold: int   = 0
 
-        self.__hoverText        = pygame.Font(regularFont, 24)
-
         self.name               = levelName
         self.play: bool         = False # whether play of level is requested
 
@@ -288,6 +384,13 @@ class LevelSelector:
             self.item = HoverItem(
                 pos, utils.unifiedPath("res/sprites/buttons/levels/locked.png")
             )
+
+        # hover text, fixed after construction so rendered just once
+        if self.__locked:
+            hoverText = f"{utils.friendlyNames[self.name]}\n\nunlock with score {self.__threshold} in {utils.friendlyNames[self.__reqLevel]}"
+        else:
+            hoverText = f"{utils.friendlyNames[self.name]}\n\nhigh score : {utils.getHighScore(self.name)}"
+        self.__hoverSurf = loadFont(regularFont, 24).render(hoverText, True, utils.uiColors["text"])
     
     def update(self, dt: float):
         """
@@ -300,22 +403,7 @@ class LevelSelector:
         if not self.__locked and self.item.clicked: # check locked to not access clicked from HoverItem
             self.play = True
         if self.item.hovering: # hover text
-            if self.__locked:
-                screen.blit(
-                    self.__hoverText.render(
-                        f"{utils.friendlyNames[self.name]}\n\nunlock with score {self.__threshold} in {utils.friendlyNames[self.__reqLevel]}",
-                        True, utils.uiColors["text"]
-                    ),
-                    (480, 160)
-                )
-            else:
-                screen.blit(
-                    self.__hoverText.render(
-                        f"{utils.friendlyNames[self.name]}\n\nhigh score : {utils.getHighScore(self.name)}",
-                        True, utils.uiColors["text"]
-                    ),
-                    (480, 160)
-                )
+            screen.blit(self.__hoverSurf, (480, 160))
 
 class LifeManager:
     "Class for managing game lives."
@@ -323,10 +411,19 @@ class LifeManager:
         self.__pos          = pos
         self.__max          = lifeNum # maximum number of lives given
 
-        self.__lifeSprite   = pygame.image.load(utils.unifiedPath("res/sprites/game/life.png"))
-        self.__deathSirpte  = pygame.image.load(utils.unifiedPath("res/sprites/game/death.png"))
+        self.__lifeSprite   = loadImage(utils.unifiedPath("res/sprites/game/life.png"))
+        self.__deathSirpte  = loadImage(utils.unifiedPath("res/sprites/game/death.png"))
+
+        positions           = [ # position of each life, spaced by life sprite height for consistency
+            (pos[0], pos[1] + i * (self.__lifeSprite.height + 20)) for i in range(lifeNum)
+        ]
+        self.__blitSeqs     = [ # blit sequence for each life num, so nothing is built per frame
+            [(self.__lifeSprite, positions[i]) for i in range(num)]
+            + [(self.__deathSirpte, positions[i]) for i in range(num, lifeNum)]
+            for num in range(lifeNum + 1)
+        ]
 
-        self.__killSound    = pygame.mixer.Sound(utils.unifiedPath("res/audio/sfx/kill.mp3"))
+        self.__killSound    = loadSound(utils.unifiedPath("res/audio/sfx/kill.mp3"))
 
         self.num            = lifeNum # current life num
     
@@ -336,7 +433,6 @@ class LifeManager:
         Does nothing if there are 0 lives.
         """
         self.num = max(self.num - 1, 0)
-        self.__killSound.set_volume(sfxState / 3)
         self.__killSound.play()
 
     def update(self):
@@ -344,18 +440,7 @@ class LifeManager:
         Updates the life manager. Should be called periodically.
         `dt` specifies the seconds since the last call.
         """
-        newPos: list[int, int] = list(self.__pos)
-
-        for i in range(self.num): # show lives
-            screen.blit(
-                self.__lifeSprite, tuple(newPos)
-            )
-            newPos[1] += self.__lifeSprite.height + 20
-        for i in range(self.__max - self.num): # show deaths
-            screen.blit(
-                self.__deathSirpte, tuple(newPos)
-            )
-            newPos[1] += self.__lifeSprite.height + 20 # still use life sprite height for consistency
+        screen.blits(self.__blitSeqs[self.num], doreturn = False) # show lives then deaths
 
 class VerticalTimer:
     """
@@ -369,8 +454,8 @@ class VerticalTimer:
         time: int
     ):
         self.__pos                   = pos
-        self.__base: pygame.Surface  = pygame.image.load(baseImage)
-        self.__bar: pygame.Surface   = pygame.image.load(timerImage)
+        self.__base: pygame.Surface  = loadImage(baseImage)
+        self.__bar: pygame.Surface   = loadImage(timerImage)
 
         self.__width: int            = self.__bar.get_width()
         self.__height: int           = self.__bar.get_height()
@@ -378,7 +463,7 @@ class VerticalTimer:
         self.__perSecond: float      = self.__height / time
         self.__progress: float       = 0.0 # fraction of length
 
-        self.__warnSound             = pygame.mixer.Sound(utils.unifiedPath("res/audio/sfx/warning.mp3"))
+        self.__warnSound             = loadSound(utils.unifiedPath("res/audio/sfx/warning.mp3"))
         self.__warnSoundPlayed       = False # whether sound already played
         
         self.restarted: bool         = False # whether the timer has just completed a full time
@@ -407,7 +492,6 @@ class VerticalTimer:
         
         # play warning
         if self.__progress >= 0.75 * self.__height and not self.__warnSoundPlayed:
-            self.__warnSound.set_volume(sfxState / 3)
             self.__warnSound.play()
             self.__warnSoundPlayed = True # prevent sound from playing repeatedly
         
@@ -419,6 +503,44 @@ class VerticalTimer:
             )
         )
 
+class ShapeView:
+    """
+    A class representing the background shape of menu pages, rotated by the mouse.
+    The shape is only rendered by OpenGL again when its rotation changes, otherwise the last render is reused.
+
+    `shape` is the extruded shape to show.
+    """
+    def __init__(self, shape: dict):
+        self.__shape: dict             = shape
+        self.__theta: int              = None # rotation of the last render
+        self.__pendingRenders: int     = 0 # renders left until the read back frame shows the current rotation
+        self.__surface: pygame.Surface = None
+
+        render.discardReadback() # do not show the last frame of the previous page
+
+    def update(self):
+        "Updates the shape view. Should be called periodically."
+        theta = mouseTheta()
+        if theta != self.__theta:
+            self.__theta = theta
+            self.__pendingRenders = 2 # read back is one frame behind, so render twice to catch up
+        
+        if self.__pendingRenders > 0:
+            render.reset()
+            render.setupScene()
+
+            render.drawPolygon(
+                self.__shape["vertices"], self.__shape["bases"], self.__shape["quads"], self.__shape["isConvex"],
+                utils.uiColors["button_normal"],
+                dx = 4, dz = -1, theta = theta
+            )
+
+            render.finish()
+            self.__surface = getGlRender()
+            self.__pendingRenders -= 1
+        
+        screen.blit(self.__surface)
+
 #-----------------------------------------------------------------------------
 # game page loops
 #-----------------------------------------------------------------------------
@@ -426,19 +548,22 @@ class VerticalTimer:
 def loadingPage():
     "The loading screen page."
     # splash
-    splash: pygame.Surface = pygame.image.load(utils.unifiedPath("res/sprites/misc/splash.png"))
+    splash: pygame.Surface = pygame.image.load(utils.unifiedPath("res/sprites/misc/splash.png")).convert_alpha()
+    splashRect: pygame.Rect = splash.get_rect(topleft = (340, 257)) # at center, only area redrawn each frame
 
     # other
     alpha: int = 0
     sumt: float = 0
     dt: float = 0
 
+    screen.fill("black") # whole screen only once
+    pygame.display.flip()
+
     while True:
         # exit input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                global running ; running = False
-                return
+        if quitRequested(True):
+            global running ; running = False
+            return
 
         # go to menu if time exceeded
         if sumt >= 4:
@@ -452,11 +577,11 @@ def loadingPage():
             alpha = max(alpha - 255 * dt * 2, 0) # min of 0
         splash.set_alpha(alpha)
 
-        screen.fill("black")
-        screen.blit(splash, (340, 257)) # at center
+        screen.fill("black", splashRect)
+        screen.blit(splash, splashRect)
 
         # final
-        pygame.display.flip()
+        pygame.display.update(splashRect)
         dt = clock.tick(fps) / 1000
         sumt += dt
 
@@ -465,7 +590,7 @@ def menuPage(bgShape: str) -> str | None:
     # shape
     global lastPage
     shapeName: str = polygons.randomShape() if bgShape == None or lastPage == 2 else bgShape # conditions for new bg shape
-    shape = polygons.extrude(polygons.get(shapeName))
+    shapeView = ShapeView(polygons.extrude(polygons.get(shapeName)))
 
     # buttons
     playBut = Button(
@@ -493,9 +618,19 @@ def menuPage(bgShape: str) -> str | None:
         utils.unifiedPath("res/sprites/buttons/menu/credits_a.png")
     )
 
+    buttons: list[tuple[Button, int]] = [ # each button with the page it goes to
+        (playBut, 1), # level select
+        (settingsBut, 3), # settings
+        (tutorialBut, 4), # tutorial
+        (creditsBut, 5) # credits
+    ]
+
     # others
-    backdrop: pygame.Surface  = pygame.image.load(utils.unifiedPath("res/sprites/misc/backdrop.png"))
-    versionText = pygame.Font(regularFont, 20)
+    backdrop: pygame.Surface  = loadImage(utils.unifiedPath("res/sprites/misc/backdrop.png"), opaque = True)
+    logo: pygame.Surface      = loadImage(utils.unifiedPath("res/sprites/misc/logo.png"))
+    versionText = loadFont(regularFont, 20)
+    versionSurf: pygame.Surface = renderText(versionText, utils.versionString, utils.uiColors["text"]) # static, rendered once
+    versionPos: tuple[int, int] = bottomRightTextPos(versionText, utils.versionString, 30, 20)
     dt: float = 0
 
     # music
@@ -505,67 +640,40 @@ def menuPage(bgShape: str) -> str | None:
 
     while True:
         # exit input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                global running ; running = False
-                return None
+        if quitRequested(True):
+            global running ; running = False
+            return None
+        pollMouse() # poll once for every widget this frame
 
         # render
         screen.blit(backdrop)
 
-        render.reset()
-        render.setupScene()
-
-        render.drawPolygon(
-            shape["vertices"], shape["bases"], shape["quads"], shape["isConvex"],
-            utils.uiColors["button_normal"],
-            dx = 4, dz = -1, theta = mouseTheta()
-        )
+        shapeView.update()
 
-        render.finish()
-        screen.blit(getGlRender())
-
-        screen.blit( # logo
-            pygame.image.load(utils.unifiedPath("res/sprites/misc/logo.png")),
-            (100, 100)
-        )
+        screen.blit(logo, (100, 100))
         screen.blit( # version text
-            versionText.render(utils.versionString, True, utils.uiColors["text"]),
-            bottomRightTextPos(versionText, utils.versionString, 30, 20)
+            versionSurf,
+            versionPos
         )
 
-        playBut.update(dt)
-        settingsBut.update(dt)
-        tutorialBut.update(dt)
-        creditsBut.update(dt)
-
-        # post-render
         global pageNum
-        if playBut.clicked:
-            pageNum = 1 # go to level select
-            lastPage = 0
-            return shapeName
-        if settingsBut.clicked:
-            pageNum = 3 # go to settings
-            lastPage = 0
-            return shapeName
-        if tutorialBut.clicked:
-            pageNum = 4 # go to tutorial
-            lastPage = 0
-            return shapeName
-        if creditsBut.clicked:
-            pageNum = 5 # go to credits
-            lastPage = 0
-            return shapeName
+        for but, page in buttons:
+            but.update(dt)
+
+            # post-render
+            if but.clicked:
+                pageNum = page
+                lastPage = 0
+                return shapeName
 
         # final
         pygame.display.flip()
-        dt = clock.tick(fps) / 1000
+        dt = clock.tick(pageFps) / 1000
 
 def levelsPage(bgShape: str) -> str | None:
     "The level selection page."
     # shape
-    shape = polygons.extrude(polygons.get(bgShape))
+    shapeView = ShapeView(polygons.extrude(polygons.get(bgShape)))
 
     # buttons
     backBut = Button(
@@ -584,39 +692,30 @@ def levelsPage(bgShape: str) -> str | None:
     ]
 
     # others
-    backdrop: pygame.Surface  = pygame.image.load(utils.unifiedPath("res/sprites/misc/backdrop.png"))
-    versionText = pygame.Font(regularFont, 20)
+    backdrop: pygame.Surface  = loadImage(utils.unifiedPath("res/sprites/misc/backdrop.png"), opaque = True)
+    versionText = loadFont(regularFont, 20)
+    versionSurf: pygame.Surface = renderText(versionText, utils.versionString, utils.uiColors["text"]) # static, rendered once
+    versionPos: tuple[int, int] = bottomRightTextPos(versionText, utils.versionString, 30, 20)
     dt: float = 0
 
     while True:
         # exit input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                global running ; running = False
-                return
+        if quitRequested(True):
+            global running ; running = False
+            return
+        pollMouse() # poll once for every widget this frame
         
         # render
         screen.blit(backdrop)
 
-        render.reset()
-        render.setupScene()
-
-        render.drawPolygon(
-            shape["vertices"], shape["bases"], shape["quads"], shape["isConvex"],
-            utils.uiColors["button_normal"],
-            dx = 4, dz = -1, theta = mouseTheta()
-        )
-
-        render.finish()
-        screen.blit(getGlRender())
+        shapeView.update()
 
         screen.blit( # version text
-            versionText.render(utils.versionString, True, utils.uiColors["text"]),
-            bottomRightTextPos(versionText, utils.versionString, 30, 20)
+            versionSurf,
+            versionPos
         )
 
         backBut.update(dt)
-        for sel in selectors: sel.update(dt)
 
         # post-render
         global pageNum, lastPage
@@ -625,6 +724,7 @@ def levelsPage(bgShape: str) -> str | None:
             lastPage = 1
             return None
         for sel in selectors:
+            sel.update(dt)
             if sel.play: # level chosen
                 pageNum = 2
                 lastPage = 1
@@ -636,13 +736,80 @@ def levelsPage(bgShape: str) -> str | None:
 
         # final
         pygame.display.flip()
-        dt = clock.tick(fps) / 1000
+        dt = clock.tick(pageFps) / 1000
+
+def pauseMenu() -> bool:
+    """
+    The pause submenu of the game page, shown over the last game frame.
+    Returns whether the game should resume.
+    """
+    # capture screne
+    background: pygame.Surface = screen.copy() # display has no alpha, so already opaque and blitted as a straight copy
+
+    pygame.mixer.music.pause()
+
+    # buttons
+    resumeBut = Button(
+        (50, 100),
+        utils.unifiedPath("res/sprites/buttons/game/resume_n.png"),
+        utils.unifiedPath("res/sprites/buttons/game/resume_s.png"),
+        utils.unifiedPath("res/sprites/buttons/game/resume_a.png"),
+        clickSound = utils.unifiedPath("res/audio/sfx/resume.mp3")
+    )
+    exitBut = Button(
+        (50, 190),
+        utils.unifiedPath("res/sprites/buttons/game/exit_n.png"),
+        utils.unifiedPath("res/sprites/buttons/game/exit_s.png"),
+        utils.unifiedPath("res/sprites/buttons/game/exit_a.png")
+    )
+
+    # other
+    dt: float = 0
+
+    # sound
+    pauseSound = loadSound(utils.unifiedPath("res/audio/sfx/pause.mp3"))
+    pauseSound.play()
+
+    while True:
+        # pre-input
+        pygame.mouse.set_relative_mode(False) # release
+
+        # exit input
+        if quitRequested():
+            global running ; running = False
+            return False
+        pollMouse() # poll once for every widget this frame
+
+        # render
+        screen.blit(background)
+
+        resumeBut.update(dt)
+        exitBut.update(dt)
+
+        # post-render
+        global lastPage, pageNum
+        if resumeBut.clicked:
+            pygame.mixer.music.unpause()
+            return True
+        if exitBut.clicked:
+            lastPage = 2
+            pageNum = 0 # go to menu
+
+            # unload music
+            pygame.mixer.music.unload()
+
+            return False
+
+        # final
+        pygame.display.flip()
+        dt = clock.tick(pageFps) / 1000 # only buttons move while paused
 
 def gamePage(gameShape: str):
     "The game page."
     # game screen elements
     amp: int = 4 # absolute amplitude amount outward
     period: int = 3.5 # seconds
+    periodMs: int = int(period * 1000)
 
     control: dict = polygons.extrude(polygons.get(gameShape)) # currently controlling shape
     forward: bool = True # "forward" means SE-NW, the reverse means SW-NE
@@ -650,11 +817,11 @@ def gamePage(gameShape: str):
     controlY: int = amp
     controlTheta: float = 0
     thetaOffset: int = randTheta() # init with random
-    pt: float = 0 # period time; x-value of movement function
+    pt: int = 0 # period time in ms; x-value of movement function, kept integral so wrapping never drifts
 
     colIndex: int = 0 # index of color of control
 
-    tower: list[dict] = [] # tower representing the stacks of shapes on top of base in ascending order
+    tower: deque[dict] = deque(maxlen = 7) # tower representing the stacks of shapes on top of base in ascending order, bottom shaved off when full
     towerBase: dict = control # base of tower, set initially to the same as the control block
     stack: int = len(tower) # tower height
 
@@ -669,16 +836,21 @@ def gamePage(gameShape: str):
     )
 
     # text
-    pauseText = pygame.Font(regularFont, 30)
-    scoreText = pygame.Font(boldFont, 100)
-    highScoreText = pygame.Font(regularFont, 20)
+    pauseText = loadFont(regularFont, 30)
+    scoreText = loadFont(boldFont, 100)
+    highScoreText = loadFont(regularFont, 20)
 
     # other
-    backdrop: pygame.Surface  = pygame.image.load(utils.unifiedPath("res/sprites/misc/backdrop.png"))
+    backdrop: pygame.Surface  = loadImage(utils.unifiedPath("res/sprites/misc/backdrop.png"), opaque = True)
 
     score: int = 0
     highScore: int = utils.getHighScore(gameShape)
 
+    # static text, rendered once
+    pauseSurf: pygame.Surface = renderText(pauseText, "press ESC to pause", utils.uiColors["text"])
+    highScoreSurf: pygame.Surface = renderText(highScoreText, f"high score : {highScore}", utils.uiColors["text"])
+    highScorePos: tuple[int, int] = topCenterTextPos(highScoreText, f"high score : {highScore}", 50)
+
     clicked: bool = False # whether screen clicked
 
     paused: bool = False # whether to go through pase menu loop
@@ -689,8 +861,9 @@ def gamePage(gameShape: str):
     pygame.mixer.music.load(utils.unifiedPath("res/audio/game.mp3"))
     pygame.mixer.music.play(-1)
 
-    stackSound = pygame.mixer.Sound(utils.unifiedPath("res/audio/sfx/stack.mp3"))
-    stackSound.set_volume(sfxState / 3)
+    stackSound = loadSound(utils.unifiedPath("res/audio/sfx/stack.mp3"))
+
+    render.discardReadback() # do not show the last frame of the previous page
 
     while True:
         # pre-input
@@ -699,7 +872,7 @@ def gamePage(gameShape: str):
         clicked = False
 
         # input handling
-        for event in pygame.event.get():
+        for event in pygame.event.get([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN]):
             if event.type == pygame.QUIT:
                 global running ; running = False
                 return
@@ -709,6 +882,8 @@ def gamePage(gameShape: str):
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == pygame.BUTTON_LEFT:
                     clicked = True
+        pygame.event.clear(pump = False) # discard unhandled events, without pumping in new ones
+        pollMouse() # poll once for the rest of the frame
         
         # game over screen
         if gameover:
@@ -721,7 +896,13 @@ def gamePage(gameShape: str):
                     newHigh = True
                 
                 # blurred screen
-                blurred: pygame.Surface = pygame.transform.gaussian_blur(screen, 20) # gaussian blur
+                blurred: pygame.Surface = pygame.transform.smoothscale( # gaussian blur, done at quarter size then scaled back up
+                    pygame.transform.gaussian_blur(
+                        pygame.transform.smoothscale(screen, (width // 4, height // 4)),
+                        5 # quarter of full size radius of 20
+                    ),
+                    (width, height)
+                )
                 blurred.set_alpha(127) # around 50% alpha
 
                 # buttons
@@ -738,6 +919,18 @@ def gamePage(gameShape: str):
                     utils.unifiedPath("res/sprites/buttons/game/exit_a.png")
                 )
 
+                buttons: list[tuple[Button, int]] = [ # each button with the page it goes to
+                    (retryBut, 2), # come back to this page again
+                    (exitBut, 0) # menu
+                ]
+
+                # text, fixed once game is over so rendered and placed just once
+                highText: str = "new high!" if newHigh else f"high score : {highScore}"
+                resultBlits: list[tuple[pygame.Surface, tuple[int, int]]] = [
+                    (renderText(scoreText, str(score), utils.uiColors["text"]), topRightTextPos(scoreText, str(score), 500, 310)),
+                    (renderText(highScoreText, highText, utils.uiColors["text"]), topRightTextPos(highScoreText, highText, 500, 410))
+                ]
+
                 # other
                 pygame.mixer.music.unload()
 
@@ -748,43 +941,25 @@ def gamePage(gameShape: str):
                     pygame.mouse.set_relative_mode(False) # release
 
                     # exit input
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            global running ; running = False
-                            return
+                    if quitRequested(True):
+                        global running ; running = False
+                        return
+                    pollMouse() # poll once for every widget this frame
                     
                     # render
                     screen.fill("white")
                     screen.blit(blurred)
 
-                    screen.blit(
-                        scoreText.render(str(score), True, utils.uiColors["text"]),
-                        topRightTextPos(scoreText, str(score), 500, 310)
-                    )
-                    if newHigh:
-                        screen.blit(
-                            highScoreText.render("new high!", True, utils.uiColors["text"]),
-                            topRightTextPos(highScoreText, "new high!", 500, 410)
-                        )
-                    else:
-                        screen.blit(
-                            highScoreText.render(f"high score : {highScore}", True, utils.uiColors["text"]),
-                            topRightTextPos(highScoreText, f"high score : {highScore}", 500, 410)
-                        )
-
-                    retryBut.update(dt)
-                    exitBut.update(dt)
+                    screen.blits(resultBlits, doreturn = False)
 
                     # post-render
                     global lastPage, pageNum
-                    if retryBut.clicked:
-                        lastPage = 2
-                        pageNum = 2 # come back to this page again
-                        return
-                    if exitBut.clicked:
-                        lastPage = 2
-                        pageNum = 0 # go to menu
-                        return
+                    for but, page in buttons:
+                        but.update(dt)
+                        if but.clicked:
+                            lastPage = 2
+                            pageNum = page
+                            return
 
                     # final
                     pygame.display.flip()
@@ -795,125 +970,47 @@ def gamePage(gameShape: str):
 
         # pause submenu
         if paused:
-            def paused() -> bool:
-                # capture screne
-                background: pygame.Surface = screen.copy()
-
-                pygame.mixer.music.pause()
-
-                # buttons
-                resumeBut = Button(
-                    (50, 100),
-                    utils.unifiedPath("res/sprites/buttons/game/resume_n.png"),
-                    utils.unifiedPath("res/sprites/buttons/game/resume_s.png"),
-                    utils.unifiedPath("res/sprites/buttons/game/resume_a.png"),
-                    clickSound = utils.unifiedPath("res/audio/sfx/resume.mp3")
-                )
-                exitBut = Button(
-                    (50, 190),
-                    utils.unifiedPath("res/sprites/buttons/game/exit_n.png"),
-                    utils.unifiedPath("res/sprites/buttons/game/exit_s.png"),
-                    utils.unifiedPath("res/sprites/buttons/game/exit_a.png")
-                )
-
-                # other
-                dt: float = 0
-
-                # sound
-                pauseSound = pygame.mixer.Sound(utils.unifiedPath("res/audio/sfx/pause.mp3"))
-                pauseSound.set_volume(sfxState / 3)
-                pauseSound.play()
-
-                while True:
-                    # pre-input
-                    pygame.mouse.set_relative_mode(False) # release
-
-                    # exit input
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            global running ; running = False
-                            return
-                    
-                    # render
-                    screen.blit(background)
-
-                    resumeBut.update(dt)
-                    exitBut.update(dt)
-
-                    # post-render
-                    global lastPage, pageNum
-                    if resumeBut.clicked:
-                        pygame.mixer.music.unpause()
-                        return True
-                    if exitBut.clicked:
-                        lastPage = 2
-                        pageNum = 0 # go to menu
-
-                        # unload music
-                        pygame.mixer.music.unload()
-
-                        return False
-
-                    # final
-                    pygame.display.flip()
-                    dt = clock.tick(fps) / 1000
-
-            cont: bool = paused() # whether to continue
+            cont: bool = pauseMenu() # whether to continue
             paused = False
             if cont: continue
             else: return
 
         # pre-render
-        if len(tower) > 7:
-            tower.pop(0) # shave off bottom
         stack = len(tower)
 
-        if forward: # SE-NW
-            controlX = ctrlPos(amp, period, -0.5, pt) # d = -1/2 period shift
-        else: # SW-NE
-            controlX = ctrlPos(amp, period, 0, pt)
-        controlY = ctrlPos(amp, period, 0, pt) # d = 0 period shift
+        controlY = ctrlPos(amp, periodMs, 0, pt) # d = 0 period shift
+        # a triangle wave shifted by half its period is its negation, so X never needs its own evaluation
+        controlX = -controlY if forward else controlY # SE-NW, else SW-NE
         controlTheta = mouseTheta(offset = thetaOffset) # apply offset of random angle
 
         # render
-        screen.blit(backdrop)
-
         render.reset()
         render.setupScene()
 
-        render.drawPolygon( # render control block
-            control["vertices"], control["bases"], control["quads"], control["isConvex"],
-            utils.blockColors[colIndex],
-            dx = controlX, dy = controlY, theta = controlTheta
-        )
-        render.drawPolygon( # render tower base
-            towerBase["vertices"], towerBase["bases"], towerBase["quads"], towerBase["isConvex"],
-            (64, 64, 64), # 25% gray
-            dz = -1 - stack, theta = 45 # only tower base is rotated because it is the original shape
+        shapes: list[dict] = [control, towerBase, *tower]
+        render.drawPolygons( # render all blocks together
+            [(shape["vertices"], shape["bases"], shape["quads"], shape["isConvex"]) for shape in shapes],
+            np.vstack((
+                utils.blockColorArray[colIndex], # control block
+                (64, 64, 64), # tower base, 25% gray
+                utils.blockColorArray[np.arange(colIndex - stack, colIndex) % len(utils.blockColorArray)] # rest of tower stack, colors leading up to control
+            )),
+            [
+                (controlX, controlY, 0, controlTheta), # control block
+                (0, 0, -1 - stack, 45) # only tower base is rotated because it is the original shape
+            ] + [
+                (0, 0, i - stack, 0) for i in range(stack) # move down based on height
+            ]
         )
-        for i in range(stack): # render rest of tower stack
-            newColIndex = (colIndex - stack + i) % len(utils.blockColors)
-            render.drawPolygon(
-                tower[i]["vertices"], tower[i]["bases"], tower[i]["quads"], tower[i]["isConvex"],
-                utils.blockColors[newColIndex],
-                dz = i - stack # move down based on height
-            )
 
         render.finish()
-        screen.blit(getGlRender())
-
-        screen.blit(
-            pauseText.render("press ESC to pause", True, utils.uiColors["text"]),
-            (50, 50)
-        )
-        screen.blit(
-            scoreText.render(str(score), True, utils.uiColors["primary"]),
-            topCenterTextPos(scoreText, str(score), 80)
-        )
-        screen.blit(
-            highScoreText.render(f"high score : {highScore}", True, utils.uiColors["text"]),
-            topCenterTextPos(highScoreText, f"high score : {highScore}", 50)
-        )
+        screen.fblits(( # backdrop, scene and text in one call
+            (backdrop, (0, 0)),
+            (getGlRender(), (0, 0)),
+            (pauseSurf, (50, 50)),
+            (renderText(scoreText, str(score), utils.uiColors["primary"]), topCenterTextPos(scoreText, str(score), 80)), # memoized per score
+            (highScoreSurf, highScorePos)
+        ))
 
         lives.update()
         timer.update(dt)
@@ -933,8 +1030,6 @@ def gamePage(gameShape: str):
                 newBase = polygons.spacialTransform(tower[-1]["polygon"], render.getMatrix(
                     0, 0, -1, 0
                 ))
-            render.reset()
-            render.setupScene(xtheta = 0)
             newControl = polygons.spacialTransform(control["polygon"], render.getMatrix(
                 controlX, controlY, 0, controlTheta # use current control transformations
             ))
@@ -966,13 +1061,14 @@ def gamePage(gameShape: str):
 
         # final
         pygame.display.flip()
-        dt = clock.tick(fps) / 1000
-        pt = (pt + dt) % period
+        frameMs: int = clock.tick(fps) # whole ms, exact unlike dt
+        dt = frameMs / 1000
+        pt = (pt + frameMs) % periodMs
 
 def settingsPage(bgShape: str):
     "The settings page."
     # shape
-    shape = polygons.extrude(polygons.get(bgShape))
+    shapeView = ShapeView(polygons.extrude(polygons.get(bgShape)))
 
     # buttons
     backBut = Button(
@@ -981,7 +1077,7 @@ def settingsPage(bgShape: str):
         utils.unifiedPath("res/sprites/buttons/back_s.png"),
         utils.unifiedPath("res/sprites/buttons/back_a.png")
     )
-    global musicState, sfxState, invertXAxis
+    global musicState, invertXAxis
     musicBut = CycleButton(
         (350, 240),
         [
@@ -1044,35 +1140,27 @@ def settingsPage(bgShape: str):
     )
 
     # others
-    backdrop: pygame.Surface  = pygame.image.load(utils.unifiedPath("res/sprites/misc/settings.png")) # settings backdrop
-    versionText = pygame.Font(regularFont, 20)
+    backdrop: pygame.Surface  = loadImage(utils.unifiedPath("res/sprites/misc/settings.png"), opaque = True) # settings backdrop
+    versionText = loadFont(regularFont, 20)
+    versionSurf: pygame.Surface = renderText(versionText, utils.versionString, utils.uiColors["text"]) # static, rendered once
+    versionPos: tuple[int, int] = bottomRightTextPos(versionText, utils.versionString, 30, 20)
     dt: float = 0
 
     while True:
         # exit input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                global running ; running = False
-                return
+        if quitRequested():
+            global running ; running = False
+            return
+        pollMouse() # poll once for every widget this frame
         
         # render
         screen.blit(backdrop)
 
-        render.reset()
-        render.setupScene()
-
-        render.drawPolygon(
-            shape["vertices"], shape["bases"], shape["quads"], shape["isConvex"],
-            utils.uiColors["button_normal"],
-            dx = 4, dz = -1, theta = mouseTheta()
-        )
-
-        render.finish()
-        screen.blit(getGlRender())
+        shapeView.update()
 
         screen.blit( # version text
-            versionText.render(utils.versionString, True, utils.uiColors["text"]),
-            bottomRightTextPos(versionText, utils.versionString, 30, 20)
+            versionSurf,
+            versionPos
         )
 
         backBut.update(dt)
@@ -1091,17 +1179,18 @@ def settingsPage(bgShape: str):
         musicState = musicBut.cycleState
         pygame.mixer.music.set_volume(musicState / 3) # range from 0 to 1
 
-        sfxState = sfxBut.cycleState
+        if sfxBut.cycleState != sfxState: # only apply volume when changed
+            setSfxState(sfxBut.cycleState)
         invertXAxis = bool(invertBut.cycleState)
 
         # final
         pygame.display.flip()
-        dt = clock.tick(fps) / 1000
+        dt = clock.tick(pageFps) / 1000
 
 def tutorialPage(bgShape: str):
     "The tutorial page."
     # shape
-    shape = polygons.extrude(polygons.get(bgShape))
+    shapeView = ShapeView(polygons.extrude(polygons.get(bgShape)))
 
     # buttons
     backBut = Button(
@@ -1112,35 +1201,27 @@ def tutorialPage(bgShape: str):
     )
 
     # others
-    backdrop: pygame.Surface  = pygame.image.load(utils.unifiedPath("res/sprites/misc/tutorial.png")) # tutorial backdrop
-    versionText = pygame.Font(regularFont, 20)
+    backdrop: pygame.Surface  = loadImage(utils.unifiedPath("res/sprites/misc/tutorial.png"), opaque = True) # tutorial backdrop
+    versionText = loadFont(regularFont, 20)
+    versionSurf: pygame.Surface = renderText(versionText, utils.versionString, utils.uiColors["text"]) # static, rendered once
+    versionPos: tuple[int, int] = bottomRightTextPos(versionText, utils.versionString, 30, 20)
     dt: float = 0
 
     while True:
         # exit input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                global running ; running = False
-                return
+        if quitRequested():
+            global running ; running = False
+            return
+        pollMouse() # poll once for every widget this frame
         
         # render
         screen.blit(backdrop)
 
-        render.reset()
-        render.setupScene()
-
-        render.drawPolygon(
-            shape["vertices"], shape["bases"], shape["quads"], shape["isConvex"],
-            utils.uiColors["button_normal"],
-            dx = 4, dz = -1, theta = mouseTheta()
-        )
-
-        render.finish()
-        screen.blit(getGlRender())
+        shapeView.update()
 
         screen.blit( # version text
-            versionText.render(utils.versionString, True, utils.uiColors["text"]),
-            bottomRightTextPos(versionText, utils.versionString, 30, 20)
+            versionSurf,
+            versionPos
         )
 
         backBut.update(dt)
@@ -1154,12 +1235,12 @@ def tutorialPage(bgShape: str):
 
         # final
         pygame.display.flip()
-        dt = clock.tick(fps) / 1000
+        dt = clock.tick(pageFps) / 1000
 
 def creditsPage(bgShape: str):
     "The credits page."
     # shape
-    shape = polygons.extrude(polygons.get(bgShape))
+    shapeView = ShapeView(polygons.extrude(polygons.get(bgShape)))
 
     # buttons
     backBut = Button(
@@ -1170,35 +1251,27 @@ def creditsPage(bgShape: str):
     )
 
     # others
-    backdrop: pygame.Surface  = pygame.image.load(utils.unifiedPath("res/sprites/misc/credits.png")) # credits backdrop
-    versionText = pygame.Font(regularFont, 20)
+    backdrop: pygame.Surface  = loadImage(utils.unifiedPath("res/sprites/misc/credits.png"), opaque = True) # credits backdrop
+    versionText = loadFont(regularFont, 20)
+    versionSurf: pygame.Surface = renderText(versionText, utils.versionString, utils.uiColors["text"]) # static, rendered once
+    versionPos: tuple[int, int] = bottomRightTextPos(versionText, utils.versionString, 30, 20)
     dt: float = 0
 
     while True:
         # exit input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                global running ; running = False
-                return
+        if quitRequested():
+            global running ; running = False
+            return
+        pollMouse() # poll once for every widget this frame
         
         # render
         screen.blit(backdrop)
 
-        render.reset()
-        render.setupScene()
-
-        render.drawPolygon(
-            shape["vertices"], shape["bases"], shape["quads"], shape["isConvex"],
-            utils.uiColors["button_normal"],
-            dx = 4, dz = -1, theta = mouseTheta()
-        )
-
-        render.finish()
-        screen.blit(getGlRender())
+        shapeView.update()
 
         screen.blit( # version text
-            versionText.render(utils.versionString, True, utils.uiColors["text"]),
-            bottomRightTextPos(versionText, utils.versionString, 30, 20)
+            versionSurf,
+            versionPos
         )
 
         backBut.update(dt)
@@ -1212,7 +1285,7 @@ def creditsPage(bgShape: str):
 
         # final
         pygame.display.flip()
-        dt = clock.tick(fps) / 1000
+        dt = clock.tick(pageFps) / 1000
 
 #-----------------------------------------------------------------------------
 # main program control
@@ -1229,12 +1302,19 @@ if system() == "Darwin":
     )
 clock = pygame.Clock()
 
+# only queue handled events, everything else such as mouse motion is dropped before reaching the queue
+pygame.event.set_blocked(None) # block all
+pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN])
+
 # show loading screen
 loadingPage()
 
 # initialize glfw and OpenGL
 render.init(width, height, offsetY = 1)
 
+# load sprites and sound effects
+preloadAssets()
+
 # highscores JSON check
 utils.checkHighScoreJson()
 
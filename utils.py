@@ -6,7 +6,9 @@
 
 from pathlib import Path
 from json import load, dump
-import sys
+from functools import lru_cache
+import numpy as np
+import sys, os
 
 #-----------------------------------------------------------------------------
 # constants
@@ -14,6 +16,10 @@ import sys
 
 versionString: str   = "VERSION 1.1" # string to display on corner for version
 
+basePath: Path       = ( # parent of all relative paths, `sys._MEIPASS` if frozen from pyinstaller
+    Path(sys._MEIPASS) if hasattr(sys, "_MEIPASS") else Path(__file__).resolve().parent
+)
+
 # colors
 uiColors: dict       = {
     "text": (40, 51, 56),
@@ -42,6 +48,7 @@ blockColors: dict    = [ # 400
     (244, 114, 182), # pink
     (251, 113, 133) # rose
 ]
+blockColorArray: np.ndarray = np.asarray(blockColors, dtype = np.uint8) # contiguous copy of block colors, for indexing many at once
 
 # level unlock thresholds
 thresholds: dict     = {
@@ -81,19 +88,36 @@ friendlyNames: dict  = {
     "double_u": "Uppercase W"
 }
 
+#-----------------------------------------------------------------------------
+# private globals
+#-----------------------------------------------------------------------------
+
+__scores: dict       = None # in-memory copy of the high score file, loaded on first use
+
+#-----------------------------------------------------------------------------
+# private functions
+#-----------------------------------------------------------------------------
+
+# Returns the cached high scores, reading the high score file only the first time
+def __getScores() -> dict:
+    global __scores
+    if __scores is None:
+        with open(unifiedPath("highscores.json"), "r") as f:
+            __scores = load(f)
+    return __scores
+
 #-----------------------------------------------------------------------------
 # public functions
 #-----------------------------------------------------------------------------
 
+@lru_cache(maxsize = None)
 def unifiedPath(relativePath: str) -> Path:
     """
     Returns the absolute path of the specified relative path.
     Resolves to the parent `sys._MEIPASS` if filepath is frozen from pyinstaller.
+    Memoized since the same few paths are resolved repeatedly.
     """
-    try:
-        return Path(sys._MEIPASS) / Path(relativePath)
-    except AttributeError: # if not a pyinstaller path
-        return Path(__file__).resolve().parent / Path(relativePath)
+    return basePath / relativePath
 
 def checkHighScoreJson():
     "Checks if highscore file exists. Creates a new blank one if not."
@@ -113,13 +137,15 @@ def checkHighScoreJson():
 
 def getHighScore(shapeName: str) -> int:
     "Returns the high score for a given shape level."
-    with open(unifiedPath("highscores.json"), "r") as f:
-        return load(f)[shapeName]
+    return __getScores()[shapeName]
 
 def setHighScore(shapeName: str, highScore: int):
-    "Sets a new high score for a given shape level."
-    with open(unifiedPath("highscores.json"), "r") as f:
-        scores: dict = load(f)
+    """
+    Sets a new high score for a given shape level.
+    Written to a temporary file first then swapped in, so the high score file is never left half written.
+    """
+    scores: dict = __getScores()
     scores[shapeName] = highScore
-    with open(unifiedPath("highscores.json"), "w") as f:
-        dump(scores, f, indent = 4)
\ No newline at end of file
+    with open(unifiedPath("highscores.json.tmp"), "w") as f:
+        dump(scores, f, indent = 4)
+    os.replace(unifiedPath("highscores.json.tmp"), unifiedPath("highscores.json"))
\ No newline at end of file